@@ -18,6 +18,7 @@ License for the specific language governing permissions and limitations
 under the License.
 '''
 
+import os
 import stat
 from pathlib import Path
 
@@ -97,24 +98,27 @@ class CFSNode:
         @return: List of file names filtered according to their
         read/write perms.
         '''
-        path = Path(path)
-        if not path.is_dir():
+        try:
+            entries = os.scandir(path)
+        except (FileNotFoundError, NotADirectoryError):
             return []
 
-        if writable is None and readable is None:
-            names = [p.name for p in path.glob('*') if p.is_file()]
-        else:
-            names = []
-            for p in path.iterdir():
-                if p.is_file():
-                    sres = Path.stat(p)
-                    if (writable is not None and
-                            writable != ((sres[stat.ST_MODE] & stat.S_IWUSR) == stat.S_IWUSR)):
-                        continue
-                    if (readable is not None and
-                            readable != ((sres[stat.ST_MODE] & stat.S_IRUSR) == stat.S_IRUSR)):
-                        continue
-                    names.append(p.name)
+        # scandir entries know their type, so is_file() needs no stat
+        with entries:
+            if writable is None and readable is None:
+                names = [e.name for e in entries if e.is_file()]
+            else:
+                names = []
+                for e in entries:
+                    if e.is_file():
+                        sres = e.stat()
+                        if (writable is not None and
+                                writable != ((sres[stat.ST_MODE] & stat.S_IWUSR) == stat.S_IWUSR)):
+                            continue
+                        if (readable is not None and
+                                readable != ((sres[stat.ST_MODE] & stat.S_IRUSR) == stat.S_IRUSR)):
+                            continue
+                        names.append(e.name)
 
         return sorted(names)
 
@@ -20,11 +20,12 @@ under the License.
 
 import fcntl
 import os
-import re
 import resource
-from contextlib import suppress
+import stat
+from contextlib import contextmanager, suppress
 from pathlib import Path
 
+from . import fabric, target
 from .alua import ALUATargetPortGroup
 from .node import CFSNode
 from .utils import (
@@ -38,11 +39,71 @@ from .utils import (
     get_blockdev_type,
     get_size_for_blk_dev,
     get_size_for_disk_name,
+    is_blockdev,
     is_dev_in_use,
 )
 
 lock_file = '/var/run/rtslib_backstore.lock'
 
+@contextmanager
+def _backstore_lock():
+    '''
+    Hold the exclusive inter-process backstore index allocation lock.
+    '''
+    lock_path = Path(lock_file)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open('w+') as lkfd:
+        fcntl.flock(lkfd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lkfd, fcntl.LOCK_UN)
+
+def _read_info_file(path):
+    '''
+    Read an info file with all whitespace runs collapsed to single spaces.
+    '''
+    return ' '.join(fread(path).split())
+
+def _search_info(info, key):
+    '''
+    Return the value for key in normalized info file contents, or None.
+    The last occurrence of "key: " with a non-empty value wins and the
+    value ends at the next space or colon.
+    '''
+    needle = f"{key}: "
+    end = len(info)
+    while (pos := info.rfind(needle, 0, end)) >= 0:
+        value = info[pos + len(needle):].split(' ', 1)[0].split(':', 1)[0]
+        if value:
+            return value
+        # an empty value is skipped, look further left
+        end = pos + len(needle) - 1
+    return None
+
+def _scan_core(configfs_dir):
+    '''
+    Yield (hba directory name, DirEntry) for each storage object directory
+    found under the configfs core directory.
+    '''
+    try:
+        hbas = os.scandir(f"{configfs_dir}/core")
+    except FileNotFoundError:
+        return
+    with hbas:
+        for hba in hbas:
+            if "_" not in hba.name or not hba.is_dir(follow_symlinks=False):
+                continue
+            try:
+                entries = os.scandir(hba.path)
+            except FileNotFoundError:
+                # removed meanwhile, e.g. by another process deleting it
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        yield hba.name, entry
+
 def storage_object_get_alua_support_attr(so):
     '''
     Helper function that can be called by passthrough type of backends.
@@ -62,6 +123,11 @@ class StorageObject(CFSNode):
     '''
     # StorageObject private stuff
 
+    # contents of the info file while inside _info_snapshot(), dropped by
+    # any write that may change it
+    _info = None
+    _info_snapshots = 0
+
     def __repr__(self):
         return f"<{self.__class__.__name__} {self.plugin}/{self.name}>"
 
@@ -104,30 +170,23 @@ class StorageObject(CFSNode):
         aptpl_dir = f"{RTSRoot().dbroot}/pr"
 
         try:
-            lines = fread(f"{aptpl_dir}/aptpl_{self.wwn}").split()
+            aptpl = fread(f"{aptpl_dir}/aptpl_{self.wwn}")
         except:
             return
 
-        if not lines[0].startswith("PR_REG_START:"):
+        if not aptpl.startswith("PR_REG_START:"):
             return
 
-        reservations = []
-        for line in lines:
-            if line.startswith("PR_REG_START:"):
-                res_list = []
-            elif line.startswith("PR_REG_END:"):
-                reservations.append(res_list)
-            else:
-                res_list.append(line.strip())
-
-        for res in reservations:
-            fwrite(self.path + "/pr/res_aptpl_metadata", ",".join(res))
+        # each chunk holds one registration, terminated by PR_REG_END:
+        for chunk in aptpl.split("PR_REG_START:")[1:]:
+            if "PR_REG_END:" in chunk:
+                res = chunk.replace("PR_REG_END:", " ").split()
+                fwrite(self.path + "/pr/res_aptpl_metadata", ",".join(res))
 
     @classmethod
     def all(cls):
-        for so_dir in Path(cls.configfs_dir, 'core').glob('*_*/*'):
-            if so_dir.is_dir():
-                yield cls.so_from_path(so_dir)
+        for _, so_dir in _scan_core(cls.configfs_dir):
+            yield cls.so_from_path(so_dir.path)
 
     @classmethod
     def so_from_path(cls, path):
@@ -153,6 +212,7 @@ class StorageObject(CFSNode):
         if self.is_configured():
             path = f"{self.path}/wwn/vpd_unit_serial"
             fwrite(path, f"{wwn}\n")
+            self._info = None
         else:
             raise RTSLibError(
                 "Cannot write a T10 WWN Unit Serial to an unconfigured StorageObject")
@@ -161,6 +221,7 @@ class StorageObject(CFSNode):
         self._check_self()
         path = f"{self.path}/udev_path"
         fwrite(path, str(udev_path))
+        self._info = None
 
     def _get_udev_path(self):
         self._check_self()
@@ -180,27 +241,58 @@ class StorageObject(CFSNode):
         self._check_self()
         path = f"{self.path}/enable"
         fwrite(path, "1\n")
+        self._info = None
 
     def _control(self, command):
         self._check_self()
         path = f"{self.path}/control"
         fwrite(path, str(command).strip())
+        self._info = None
 
     def _write_fd(self, contents):
         self._check_self()
         path = f"{self.path}/fd"
         fwrite(path, str(contents).strip())
+        self._info = None
+
+    def _read_info(self):
+        if self._info is not None:
+            return self._info
+        info = _read_info_file(f"{self.path}/info")
+        if self._info_snapshots:
+            self._info = info
+        return info
+
+    @contextmanager
+    def _info_snapshot(self):
+        '''
+        Serve all info file lookups made inside the block from one read,
+        taken lazily and redone after any write to the storage object.
+        '''
+        self._info_snapshots += 1
+        try:
+            yield
+        finally:
+            self._info_snapshots -= 1
+            if not self._info_snapshots:
+                self._info = None
 
     def _parse_info(self, key):
-        self._check_self()
-        info = fread(f"{self.path}/info")
-        try:
-            return re.search(f".*{key}: ([^: ]+).*", ' '.join(info.split())).group(1)
-        except AttributeError:
-            return None
+        # info held by a snapshot was read after a successful check
+        if self._info is None:
+            self._check_self()
+        return _search_info(self._read_info(), key)
+
+    def _parse_info_many(self, keys):
+        '''
+        Like _parse_info, but reads the info file only once for all keys.
+        '''
+        if self._info is None:
+            self._check_self()
+        info = self._read_info()
+        return {key: _search_info(info, key) for key in keys}
 
     def _get_status(self):
-        self._check_self()
         return self._parse_info('Status').lower()
 
     def _gen_attached_luns(self):
@@ -208,31 +300,51 @@ class StorageObject(CFSNode):
         Fast scan of luns attached to a storage object. This is an order of
         magnitude faster than using root.luns and matching path on them.
         '''
-        isdir = os.path.isdir
-        islink = os.path.islink
-        listdir = os.listdir
-        realpath = os.path.realpath
+        scandir = os.scandir
+        readlink = os.readlink
+        normpath = os.path.normpath
         path = self.path
-        from .fabric import target_names_excludes
-        from .root import RTSRoot
-        from .target import LUN, TPG, Target
-
-        for base, fm in ((fm.path, fm) for fm in RTSRoot().fabric_modules if fm.exists):
-            for tgt_dir in listdir(base):
-                if tgt_dir not in target_names_excludes:
-                    tpgts_base = f"{base}/{tgt_dir}"
-                    for tpgt_dir in listdir(tpgts_base):
-                        luns_base = f"{tpgts_base}/{tpgt_dir}/lun"
-                        if isdir(luns_base):
-                            for lun_dir in listdir(luns_base):
-                                links_base = f"{luns_base}/{lun_dir}"
-                                for lun_file in listdir(links_base):
-                                    link = f"{links_base}/{lun_file}"
-                                    if islink(link) and realpath(link) == path:
-                                        val = (tpgt_dir + "_" + lun_dir)
-                                        val = val.split('_')
-                                        target = Target(fm, tgt_dir)
-                                        yield LUN(TPG(target, val[1]), val[3])
+        # LUN links point at the storage object dir, so a basename mismatch
+        # rules a link out without resolving it
+        so_dirname = self.name
+        target_names_excludes = fabric.target_names_excludes
+
+        # The storage object exists, so configfs is already mounted and
+        # set up; RTSRoot() would only redo those checks (and the dbroot
+        # read) on every call.
+        for base, fm in ((fm.path, fm) for fm in fabric.FabricModule.all() if fm.exists):
+            # scandir entries carry the file type, sparing a stat per name
+            with scandir(base) as tgt_entries:
+                for tgt_entry in tgt_entries:
+                    if tgt_entry.name in target_names_excludes \
+                       or not tgt_entry.is_dir(follow_symlinks=False):
+                        continue
+                    with scandir(tgt_entry.path) as tpgt_entries:
+                        for tpgt_entry in tpgt_entries:
+                            try:
+                                lun_entries = scandir(f"{tpgt_entry.path}/lun")
+                            except OSError:
+                                continue
+                            with lun_entries:
+                                for lun_entry in lun_entries:
+                                    with scandir(lun_entry.path) as links:
+                                        for link in links:
+                                            if not link.is_symlink():
+                                                continue
+                                            try:
+                                                dest = readlink(link.path)
+                                            except OSError:
+                                                continue
+                                            if dest.rpartition("/")[2] != so_dirname:
+                                                continue
+                                            if not dest.startswith("/"):
+                                                dest = f"{lun_entry.path}/{dest}"
+                                            if normpath(dest) != path:
+                                                continue
+                                            tgt = target.Target(fm, tgt_entry.name)
+                                            tpgt = tpgt_entry.name.rpartition('_')[2]
+                                            lun = lun_entry.name.rpartition('_')[2]
+                                            yield target.LUN(target.TPG(tgt, tpgt), lun)
 
     def _list_attached_luns(self):
         '''
@@ -246,9 +358,12 @@ class StorageObject(CFSNode):
         Generate all ALUA groups attach to a storage object.
         '''
         self._check_self()
-        for tpg in os.listdir(f"{self.path}/alua"):
-            if self.alua_supported:
-                yield ALUATargetPortGroup(self, tpg)
+        if not self.alua_supported:
+            return
+        with os.scandir(f"{self.path}/alua") as tpgs:
+            for tpg in tpgs:
+                if tpg.is_dir(follow_symlinks=False):
+                    yield ALUATargetPortGroup(self, tpg.name)
 
     def _get_alua_supported(self):
         '''
@@ -291,12 +406,11 @@ class StorageObject(CFSNode):
         @return: True if the StorageObject is configured, else returns False
         '''
         self._check_self()
-        path = Path(self.path) / 'enable'
         # If the StorageObject does not have the enable attribute,
         # then it is always enabled.
-        if path.is_file():
-            return bool(int(fread(path)))
-        else:
+        try:
+            return bool(int(fread(f"{self.path}/enable")))
+        except FileNotFoundError:
             return True
 
     version = property(_get_version,
@@ -367,22 +481,19 @@ class PSCSIStorageObject(StorageObject):
 
         # Use H:C:T:L format or use the path given by the user.
         try:
-            # assume 'dev' is the path, try to get h:c:t:l values
+            # h:c:t:l values can be taken as is, no udev lookup needed
             (hostid, channelid, targetid, lunid) = \
-                    convert_scsi_path_to_hctl(dev)
-            udev_path = dev.strip()
-        except:
-            # Oops, maybe 'dev' is in h:c:t:l format, try to get udev_path
+                    (int(n) for n in dev.split(':'))
+        except ValueError:
+            # not in h:c:t:l format, so assume 'dev' is the path
             try:
-                (hostid, channelid, targetid, lunid) = dev.split(':')
-                hostid = int(hostid)
-                channelid = int(channelid)
-                targetid = int(targetid)
-                lunid = int(lunid)
-            except ValueError:
+                (hostid, channelid, targetid, lunid) = \
+                        convert_scsi_path_to_hctl(dev)
+            except RTSLibError:
                 raise RTSLibError("Cannot find SCSI device by path, and dev "
-                                  "parameter not in H:C:T:L format: {dev}")
-
+                                  f"parameter not in H:C:T:L format: {dev}")
+            udev_path = dev.strip()
+        else:
             udev_path = convert_scsi_hctl_to_path(hostid,
                                                   channelid,
                                                   targetid,
@@ -392,15 +503,11 @@ class PSCSIStorageObject(StorageObject):
 
         if is_dev_in_use(udev_path):
             raise RTSLibError("Cannot configure StorageObject because "
-                              + "device %s (SCSI %d:%d:%d:%d) "
-                              % (udev_path, hostid, channelid,
-                                 targetid, lunid)
-                              + "is already in use")
-
-        self._control("scsi_host_id=%d," % hostid \
-                      + "scsi_channel_id=%d," % channelid \
-                      + "scsi_target_id=%d," % targetid \
-                      + "scsi_lun_id=%d" % lunid)
+                              f"device {udev_path} (SCSI {hostid}:{channelid}:"
+                              f"{targetid}:{lunid}) is already in use")
+
+        self._control(f"scsi_host_id={hostid},scsi_channel_id={channelid},"
+                      f"scsi_target_id={targetid},scsi_lun_id={lunid}")
         self._set_udev_path(udev_path)
         self._enable()
 
@@ -410,36 +517,33 @@ class PSCSIStorageObject(StorageObject):
         # pscsi doesn't support setting wwn
         pass
 
+    def _get_vendor_model(self):
+        # both may contain spaces, so take whatever lies between the labels
+        if self._info is None:
+            self._check_self()
+        _, _, rest = self._read_info().partition("Vendor:")
+        vendor, _, rest = rest.partition("Model:")
+        return vendor.strip(), rest.partition("Rev:")[0].strip()
+
     def _get_model(self):
-        self._check_self()
-        info = fread(f"{self.path}/info")
-        return str(re.search(".*Model:(.*)Rev:",
-                             ' '.join(info.split())).group(1)).strip()
+        return self._get_vendor_model()[1]
 
     def _get_vendor(self):
-        self._check_self()
-        info = fread(f"{self.path}/info")
-        return str(re.search(".*Vendor:(.*)Model:",
-                             ' '.join(info.split())).group(1)).strip()
+        return self._get_vendor_model()[0]
 
     def _get_revision(self):
-        self._check_self()
         return self._parse_info('Rev')
 
     def _get_channel_id(self):
-        self._check_self()
         return int(self._parse_info('Channel ID'))
 
     def _get_target_id(self):
-        self._check_self()
         return int(self._parse_info('Target ID'))
 
     def _get_lun(self):
-        self._check_self()
         return int(self._parse_info('LUN'))
 
     def _get_host_id(self):
-        self._check_self()
         return int(self._parse_info('Host ID'))
 
     def _get_alua_supported(self):
@@ -530,20 +634,16 @@ class RDMCPStorageObject(StorageObject):
         super()._configure(wwn)
 
     def _get_page_size(self):
-        self._check_self()
         return int(self._parse_info("PAGES/PAGE_SIZE").split('*')[1])
 
     def _get_pages(self):
-        self._check_self()
         return int(self._parse_info("PAGES/PAGE_SIZE").split('*')[0])
 
     def _get_size(self):
-        self._check_self()
-        size = self._get_page_size() * self._get_pages()
-        return size
+        pages, page_size = self._parse_info("PAGES/PAGE_SIZE").split('*')
+        return int(page_size) * int(pages)
 
     def _get_nullio(self):
-        self._check_self()
         # nullio not present before 3.10
         try:
             return bool(int(self._parse_info('nullio')))
@@ -562,13 +662,14 @@ class RDMCPStorageObject(StorageObject):
             doc="Get the nullio status.")
 
     def dump(self):
-        d = super().dump()
-        d['wwn'] = self.wwn
-        d['size'] = self.size
-        # only dump nullio if enabled
-        if self.nullio:
-            d['nullio'] = True
-        return d
+        with self._info_snapshot():
+            d = super().dump()
+            d['wwn'] = self.wwn
+            d['size'] = self.size
+            # only dump nullio if enabled
+            if self.nullio:
+                d['nullio'] = True
+            return d
 
 
 class FileIOStorageObject(StorageObject):
@@ -622,34 +723,42 @@ class FileIOStorageObject(StorageObject):
 
     def _configure(self, dev, size, wwn, write_back, aio):
         self._check_self()
-        block_type = get_blockdev_type(dev)
-        if block_type is None: # a file
-            if Path(dev).exists() and not Path(dev).is_file():
+        try:
+            st = Path(dev).stat()
+        except (OSError, ValueError):
+            st = None
+        if st is None or not stat.S_ISBLK(st.st_mode): # a file
+            if st is not None and not stat.S_ISREG(st.st_mode):
                 raise RTSLibError("Path not to a file or block device")
 
             if size is None:
                 raise RTSLibError("Path is to a file, size needed")
 
-            self._control("fd_dev_name=%s,fd_dev_size=%d" % (dev, size))
+            controls = [f"fd_dev_name={dev}", f"fd_dev_size={int(size)}"]
 
         else: # a block device
             # size is ignored but we can't raise an exception because
             # dump() saves it and thus restore() will call us with it.
 
-            if block_type != 0:
+            if get_blockdev_type(dev, st) != 0:
                 raise RTSLibError("Device is not a TYPE_DISK block device")
 
             if is_dev_in_use(dev):
                 raise RTSLibError(f"Device {dev} is already in use")
 
-            self._control(f"fd_dev_name={dev}")
+            controls = [f"fd_dev_name={dev}"]
 
         if write_back:
-            self.set_attribute("emulate_write_cache", 1)
-            self._control("fd_buffered_io=%d" % write_back)
+            controls.append(f"fd_buffered_io={int(write_back)}")
 
         if aio:
-            self._control("fd_async_io=%d" % aio)
+            controls.append(f"fd_async_io={int(aio)}")
+
+        # The kernel parses comma separated options in a single write
+        self._control(",".join(controls))
+
+        if write_back:
+            self.set_attribute("emulate_write_cache", 1)
 
         self._set_udev_path(dev)
 
@@ -658,29 +767,26 @@ class FileIOStorageObject(StorageObject):
         super()._configure(wwn)
 
     def _get_wb_enabled(self):
-        self._check_self()
         return bool(int(self.get_attribute("emulate_write_cache")))
 
     def _get_size(self):
-        self._check_self()
-
-        if self.is_block:
-            return (get_size_for_blk_dev(self._parse_info('File')) *
-                    int(self._parse_info('SectorSize')))
+        # udev_path, not the info 'File' token: paths may contain ':' or ' '
+        dev = self.udev_path
+        info = self._parse_info_many(('SectorSize', 'Size'))
+        if is_blockdev(dev):
+            return get_size_for_blk_dev(dev) * int(info['SectorSize'])
         else:
-            return int(self._parse_info('Size'))
+            return int(info['Size'])
 
     def _is_block(self):
-        return get_blockdev_type(self.udev_path) is not None
+        return is_blockdev(self.udev_path)
 
     def _aio(self):
-        self._check_self()
-        info = fread(f"{self.path}/info")
-        r = re.search(".*Async: ([^: ]+).*", ' '.join(info.split()))
-        if not r:  # for backward compatibility with old kernels
+        async_io = self._parse_info('Async')
+        if async_io is None:  # for backward compatibility with old kernels
             return False
 
-        return bool(int(r.group(1)))
+        return bool(int(async_io))
 
     # FileIOStorageObject public stuff
 
@@ -694,13 +800,14 @@ class FileIOStorageObject(StorageObject):
             doc="True if asynchronous I/O is enabled")
 
     def dump(self):
-        d = super().dump()
-        d['write_back'] = self.write_back
-        d['wwn'] = self.wwn
-        d['dev'] = self.udev_path
-        d['size'] = self.size
-        d['aio'] = self.aio
-        return d
+        with self._info_snapshot():
+            d = super().dump()
+            d['write_back'] = self.write_back
+            d['wwn'] = self.wwn
+            d['dev'] = self.udev_path
+            d['size'] = self.size
+            d['aio'] = self.aio
+            return d
 
 
 class BlockStorageObject(StorageObject):
@@ -754,31 +861,27 @@ class BlockStorageObject(StorageObject):
             raise RTSLibError(
                 "Cannot configure StorageObject because device {dev} is already in use")
         self._set_udev_path(dev)
-        self._control(f"udev_path={dev}")
-        self._control("readonly=%d" % readonly)
+        # iblock splits control writes on ',', so one write sets both
+        self._control(f"udev_path={dev},readonly={int(readonly)}")
         self._enable()
 
         super()._configure(wwn)
 
     def _get_major(self):
-        self._check_self()
         return int(self._parse_info('Major'))
 
     def _get_minor(self):
-        self._check_self()
         return int(self._parse_info('Minor'))
 
     def _get_size(self):
         # udev_path doesn't work here, what if LV gets renamed?
-        return get_size_for_disk_name(
-            self._parse_info('device')) * int(self._parse_info('SectorSize'))
+        info = self._parse_info_many(('device', 'SectorSize'))
+        return get_size_for_disk_name(info['device']) * int(info['SectorSize'])
 
     def _get_wb_enabled(self):
-        self._check_self()
         return bool(int(self.get_attribute("emulate_write_cache")))
 
     def _get_readonly(self):
-        self._check_self()
         # 'readonly' not present before kernel 3.6
         try:
             return bool(int(self._parse_info('readonly')))
@@ -853,36 +956,35 @@ class UserBackedStorageObject(StorageObject):
 
         if ':' in config:
             raise RTSLibError("':' not allowed in config string")
-        self._control(f"dev_config={config}")
-        self._control("dev_size=%d" % size)
+        # the kernel splits control writes on ',', so send them all at once
+        controls = [f"dev_config={config}", f"dev_size={int(size)}"]
         if hw_max_sectors is not None:
-            self._control(f"hw_max_sectors={hw_max_sectors}")
-        if control is not None:
-            self._control(control)
+            controls.append(f"hw_max_sectors={hw_max_sectors}")
+        if control:
+            controls.append(control)
+        self._control(",".join(controls))
         self._enable()
 
         super()._configure(wwn)
 
     def _get_size(self):
-        self._check_self()
         return int(self._parse_info('Size'))
 
     def _get_hw_max_sectors(self):
-        self._check_self()
         return int(self._parse_info('HwMaxSectors'))
 
     def _get_control_tuples(self):
-        self._check_self()
         tuples = []
+        info = self._parse_info_many(('MaxDataAreaMB', 'DataPagesPerBlk'))
         # 1. max_data_area_mb
-        val = self._parse_info('MaxDataAreaMB')
+        val = info['MaxDataAreaMB']
         if val != "NULL":
             tuples.append(f"max_data_area_mb={val}")
         val = self.get_attribute('hw_block_size')
         if val != "NULL":
             tuples.append(f"hw_block_size={val}")
         # 3. data_pages_per_blk
-        val = self._parse_info('DataPagesPerBlk')
+        val = info['DataPagesPerBlk']
         if val != "NULL":
             tuples.append(f"data_pages_per_blk={val}")
         # 4. add next ...
@@ -890,7 +992,6 @@ class UserBackedStorageObject(StorageObject):
         return ",".join(tuples)
 
     def _get_config(self):
-        self._check_self()
         val = self._parse_info('Config')
         if val == "NULL":
             return None
@@ -912,14 +1013,14 @@ class UserBackedStorageObject(StorageObject):
             doc="Returns true if ALUA can be setup. False if not supported.")
 
     def dump(self):
-        d = super().dump()
-        d['wwn'] = self.wwn
-        d['size'] = self.size
-        d['config'] = self.config
-        d['hw_max_sectors'] = self.hw_max_sectors
-        d['control'] = self.control_tuples
-
-        return d
+        with self._info_snapshot():
+            d = super().dump()
+            d['wwn'] = self.wwn
+            d['size'] = self.size
+            d['config'] = self.config
+            d['hw_max_sectors'] = self.hw_max_sectors
+            d['control'] = self.control_tuples
+            return d
 
 
 class StorageObjectFactory:
@@ -931,11 +1032,15 @@ class StorageObjectFactory:
     def __new__(cls, path):
         path = Path(path)
         name = path.name.replace("/", "-")
-        if path.exists():
-            if path.is_block_device():
+        try:
+            st = path.stat()
+        except OSError:
+            st = None
+        if st is not None:
+            if stat.S_ISBLK(st.st_mode):
                 return BlockStorageObject(name=name, dev=str(path))
-            elif path.is_file():
-                return FileIOStorageObject(name=name, dev=str(path), size=path.stat().st_size)
+            elif stat.S_ISREG(st.st_mode):
+                return FileIOStorageObject(name=name, dev=str(path), size=st.st_size)
 
         raise RTSLibError(f"Can't create storageobject from path: {path}")
 
@@ -961,7 +1066,62 @@ bs_params = {
     UserBackedStorageObject: {'name': 'user'},
     }
 
+# Resolve the backstore naming once per class rather than per _Backstore
+for _so_cls, _params in bs_params.items():
+    _so_cls._bs_plugin = _params['name']
+    _so_cls._bs_dirprefix = _params.get('alt_dirprefix', _params['name'])
+del _so_cls, _params
+
 bs_cache = {}
+# mtime of configfs core/ when bs_cache was last filled from it
+_bs_cache_mtime = None
+# every index below this one is known to be in use
+_bs_free_hint = 0
+# the distinct values of bs_cache, kept alongside it
+_bs_used = set()
+
+max_backstore_index = 1048576
+
+def _core_mtime(configfs_dir):
+    try:
+        return Path(configfs_dir, "core").stat().st_mtime_ns
+    except OSError:
+        return None
+
+def _fill_bs_cache(configfs_dir):
+    '''
+    Rebuild bs_cache from the backstore directories present in configfs.
+    '''
+    global _bs_cache_mtime, _bs_free_hint  # noqa: PLW0603
+    _bs_cache_mtime = _core_mtime(configfs_dir)
+    _bs_free_hint = 0
+    bs_cache.clear()
+    for hba_name, entry in _scan_core(configfs_dir):
+        bs_dirp, bs_index = hba_name.rsplit("_", 1)
+        bs_cache[f"{bs_dirp}/{entry.name}"] = int(bs_index)
+    _bs_used.clear()
+    _bs_used.update(bs_cache.values())
+
+def _refresh_bs_cache(configfs_dir):
+    '''
+    Rescan configfs if bs_cache is empty or core/ changed since the last
+    scan. Return True if it rescanned.
+    '''
+    if bs_cache and _core_mtime(configfs_dir) == _bs_cache_mtime:
+        return False
+    _fill_bs_cache(configfs_dir)
+    return True
+
+def _bs_cache_discard(lookup_key):
+    '''
+    Forget a backstore and make its index the next allocation candidate.
+    '''
+    global _bs_free_hint  # noqa: PLW0603
+    index = bs_cache.pop(lookup_key, None)
+    if index is None or index in bs_cache.values():
+        return
+    _bs_used.discard(index)
+    _bs_free_hint = min(_bs_free_hint, index)
 
 class _Backstore(CFSNode):
     """
@@ -973,92 +1133,115 @@ class _Backstore(CFSNode):
     def __init__(self, name, storage_object_cls, mode, index=None):
         super().__init__()
         self._so_cls = storage_object_cls
-        self._plugin = bs_params[self._so_cls]['name']
-
-        dirp = bs_params[self._so_cls].get("alt_dirprefix", self._plugin)
+        self._hba_info = None
+        self._plugin = storage_object_cls._bs_plugin
 
-        # if the caller knows the index then skip the cache
-        global bs_cache  # noqa: PLW0602  TODO
-        if index is None and not bs_cache:
-            for directory in Path(self.configfs_dir).glob("core/*_*/*/"):
-                parts = directory.parts
-                bs_name = parts[-1]
-                bs_dirp, bs_index = parts[-2].rsplit("_", 1)
-                current_key = f"{bs_dirp}/{bs_name}"
-                bs_cache[current_key] = int(bs_index)
+        dirp = storage_object_cls._bs_dirprefix
 
         self._lookup_key = f"{dirp}/{name}"
         if index is None:
-            self._index = bs_cache.get(self._lookup_key, None)
-            if self._index is not None and mode == 'create':
-                raise RTSLibError(f"Storage object {self._plugin}/{name} exists")
+            self._index = self._lookup_index(name, mode)
+            if self._index is None:
+                # only allocation needs the inter-process lock
+                with _backstore_lock():
+                    self._allocate_index(name, dirp, mode)
+            else:
+                self._setup(dirp, mode)
         else:
+            # if the caller knows the index then skip the cache
             self._index = int(index)
+            self._setup(dirp, mode)
 
-        if self._index is None:
-            if mode == 'lookup':
-                raise RTSLibNotInCFSError(f"Storage object {self._plugin}/{name} not found")
-            else:
-                # Allocate new index value
-                Path('/var/run').mkdir(parents=True, exist_ok=True)
-                lock_file_path = Path(lock_file)
-                with lock_file_path.open('w+') as lkfd:
-                    fcntl.flock(lkfd, fcntl.LOCK_EX)
-                    indexes = set(bs_cache.values())
-                    for i in range(1048576):
-                        if i not in indexes:
-                            self._index = i
-                            bs_cache[self._lookup_key] = self._index
-                            break
-                    else:
-                        fcntl.flock(lkfd, fcntl.LOCK_UN)
-                        raise RTSLibError("No available backstore index")
-                    fcntl.flock(lkfd, fcntl.LOCK_UN)
-
-        self._path = Path(self.configfs_dir) / "core" / f"{dirp}_{self._index}"
+    def _lookup_index(self, name, mode):
+        '''
+        Return the cached index of this backstore, or None if it has none.
+        '''
+        configfs_dir = self.configfs_dir
+        fresh = _refresh_bs_cache(configfs_dir)
+        index = bs_cache.get(self._lookup_key)
+
+        # The core/ mtime is only a hint: it is coarse, and objects added to
+        # an existing HBA directory do not touch it. So an answer that would
+        # fail the request is checked against a fresh scan first.
+        stale_miss = mode == 'lookup' and index is None
+        stale_hit = mode == 'create' and index is not None
+        if not fresh and (stale_miss or stale_hit):
+            _fill_bs_cache(configfs_dir)
+            index = bs_cache.get(self._lookup_key)
+
+        if index is not None and mode == 'create':
+            raise RTSLibError(f"Storage object {self._plugin}/{name} exists")
+        if index is None and mode == 'lookup':
+            raise RTSLibNotInCFSError(f"Storage object {self._plugin}/{name} not found")
+        return index
+
+    def _allocate_index(self, name, dirp, mode):
+        '''
+        Pick a free index and create the backstore. Call with the backstore
+        lock held.
+        '''
+        global _bs_cache_mtime, _bs_free_hint  # noqa: PLW0603
+        configfs_dir = self.configfs_dir
+
+        # another process may have changed core/ since the unlocked lookup
+        if _refresh_bs_cache(configfs_dir):
+            index = bs_cache.get(self._lookup_key)
+            if index is not None:
+                if mode == 'create':
+                    raise RTSLibError(f"Storage object {self._plugin}/{name} exists")
+                self._index = index
+                self._setup(dirp, mode)
+                return
+
+        # Start from the hint rather than zero. mtimes are coarse, so a
+        # directory made elsewhere may not be in _bs_used yet: check the
+        # candidate itself too.
+        free = _bs_free_hint
+        while free in _bs_used or Path(f"{configfs_dir}/core/{dirp}_{free}").exists():
+            free += 1
+        if free >= max_backstore_index:
+            raise RTSLibError("No available backstore index")
+        self._index = free
+        _bs_free_hint = free + 1
+        bs_cache[self._lookup_key] = free
+        _bs_used.add(free)
+
+        seen_mtime = _core_mtime(configfs_dir)
+        self._setup(dirp, mode)
+        # our own new directory is already accounted for in bs_cache, but
+        # anything else that changed core/ since the check must be rescanned
+        if seen_mtime == _bs_cache_mtime:
+            _bs_cache_mtime = _core_mtime(configfs_dir)
+
+    def _setup(self, dirp, mode):
+        self._path = f"{self.configfs_dir}/core/{dirp}_{self._index}"
+        # fixed for the lifetime of the backstore, so no properties needed
+        self.plugin = self._plugin
+        self.index = self._index
+        self.name = f"{self._plugin}{self._index}"
         try:
             self._create_in_cfs_ine(mode)
         except Exception as e:
-            if self._lookup_key in bs_cache:
-                del bs_cache[self._lookup_key]
+            _bs_cache_discard(self._lookup_key)
             raise e
 
     def delete(self):
         super().delete()
-        if self._lookup_key in bs_cache:
-            del bs_cache[self._lookup_key]
-
-    def _get_index(self):
-        return self._index
+        self._hba_info = None
+        _bs_cache_discard(self._lookup_key)
 
     def _parse_info(self, key):
         self._check_self()
-        info = fread(f"{self.path}/hba_info")
-        try:
-            return re.search(f".*{key}: ([^: ]+).*", ' '.join(info.split())).group(1)
-        except AttributeError:
-            return None
+        # hba_info (index, plugin, version) is fixed while the HBA exists
+        if self._hba_info is None:
+            self._hba_info = _read_info_file(f"{self.path}/hba_info")
+        return _search_info(self._hba_info, key)
 
     def _get_version(self):
-        self._check_self()
         return self._parse_info("version")
 
-    def _get_plugin(self):
-        self._check_self()
-        return self._plugin
-
-    def _get_name(self):
-        self._check_self()
-        return "%s%d" % (self.plugin, self.index)
-
-    plugin = property(_get_plugin,
-            doc="Get the backstore plugin name.")
-    index = property(_get_index,
-            doc="Get the backstore index as an int.")
     version = property(_get_version,
             doc="Get the Backstore plugin version string.")
-    name = property(_get_name,
-            doc="Get the backstore name.")
 
 
 def _test():
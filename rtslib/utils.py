@@ -21,6 +21,7 @@ under the License.
 import os
 import re
 import socket
+import stat
 import subprocess
 import uuid
 from contextlib import contextmanager, suppress
@@ -30,6 +31,9 @@ import pyudev
 
 _CONTEXT = pyudev.Context()
 
+# SCSI_GENERIC_MAJOR from linux/major.h
+_SCSI_GENERIC_MAJOR = 21
+
 class RTSLibError(Exception):
     '''
     Generic rtslib error.
@@ -70,7 +74,15 @@ def fwrite(path, string):
     @type string: string
 
     '''
-    Path(path).write_text(str(string))
+    # A single raw write: configfs takes each write() as one store and the
+    # text I/O stack adds nothing for these short strings.
+    data = str(string).encode()
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
 
 def fread(path):
     '''
@@ -91,7 +103,14 @@ def fread(path):
     @return: A string containing the file's contents.
 
     '''
-    return Path(path).read_text().strip()
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        while chunk := os.read(fd, 65536):
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+    return b''.join(chunks).decode().strip()
 
 def is_dev_in_use(path):
     '''
@@ -105,10 +124,13 @@ def is_dev_in_use(path):
     @return: A boolean, True is we cannot get exclusive descriptor on the path,
              False if we can.
     '''
-    path = os.path.realpath(str(path))
+    # stat() and open() follow symlinks themselves
+    path = str(path)
     try:
-        device = pyudev.Device.from_device_file(_CONTEXT, path)
-        if device.subsystem == 'scsi_generic':
+        # sg nodes are the character devices with the scsi_generic major,
+        # no udev lookup is needed to tell them apart
+        st = Path(path).stat()
+        if stat.S_ISCHR(st.st_mode) and os.major(st.st_rdev) == _SCSI_GENERIC_MAJOR:
             file_fd = os.open(path, os.O_EXCL|os.O_NDELAY|os.O_RDWR)
         else:
             file_fd = os.open(path, os.O_EXCL|os.O_NDELAY)
@@ -155,6 +177,8 @@ def get_size_for_blk_dev(path):
 
 get_block_size = get_size_for_blk_dev
 
+_disk_part_re = re.compile(r'^([a-z0-9_\-!]+?)(\d+)$')
+
 def get_size_for_disk_name(name):
     '''
     @param name: a kernel disk name, as found in /proc/partitions
@@ -181,7 +205,7 @@ def get_size_for_disk_name(name):
         return get_size(name)
     except pyudev.DeviceNotFoundError:
         # Maybe it's a partition?
-        m = re.search(r'^([a-z0-9_\-!]+?)(\d+)$', name)
+        m = _disk_part_re.search(name)
         if m:
             # If disk name ends with a digit, Linux sticks a 'p' between it and
             # the partition number in the blockdev name.
@@ -192,11 +216,26 @@ def get_size_for_disk_name(name):
         else:
             raise
 
-def get_blockdev_type(path):
+def is_blockdev(path):
+    '''
+    True if path exists and is a block device. A plain stat is enough here,
+    no udev lookup is needed just to classify the path.
+
+    @param path: path to check
+    @type path: string or Path object
+    @return: A boolean.
+    '''
+    try:
+        return stat.S_ISBLK(Path(path).stat().st_mode)
+    except (OSError, ValueError):
+        return False
+
+def get_blockdev_type(path, st=None):
     '''
     This function returns a block device's type.
     Example: 0 is TYPE_DISK
     If no match is found, None is returned.
+    Devices without a SCSI type (partitions, dm, md...) count as TYPE_DISK.
 
     >>> from rtslib.utils import *
     >>> get_blockdev_type("/dev/sda")
@@ -210,22 +249,26 @@ def get_blockdev_type(path):
 
     @param path: path to the block device
     @type path: string
+    @param st: the result of stat() on path, if the caller already has it
+    @type st: os.stat_result
     @return: An int for the block device type, or None if not a block device.
     '''
-    try:
-        device = pyudev.Device.from_device_file(_CONTEXT, path)
-    except (OSError, pyudev.DeviceNotFoundError, ValueError):
-        return None
-
-    if device.subsystem != 'block':
+    if st is None:
+        try:
+            st = Path(path).stat()
+        except (OSError, ValueError):
+            return None
+    if not stat.S_ISBLK(st.st_mode):
         return None
 
-    attributes = device.attributes
-
-    disk_type = 0
-    with suppress(KeyError, UnicodeDecodeError, ValueError):
-        disk_type = attributes.asint('device/type')
-    return disk_type
+    # the device's own sysfs node, found from its numbers, no udev lookup
+    sysfs_dev = f"/sys/dev/block/{os.major(st.st_rdev)}:{os.minor(st.st_rdev)}"
+    try:
+        return int(fread(f"{sysfs_dev}/device/type"))
+    except FileNotFoundError:
+        return 0 if Path(sysfs_dev).exists() else None
+    except (OSError, ValueError):
+        return 0
 
 get_block_type = get_blockdev_type
 
@@ -328,16 +371,16 @@ def generate_wwn(wwn_type):
         localarch = os.uname()[4].replace("_", "")
         prefix = f"iqn.2003-01.org.linux-iscsi.{localname}.{localarch}"
         prefix = prefix.strip().lower()
-        serial = f"sn.{str(uuid.uuid4())[24:]}"
+        serial = f"sn.{os.urandom(6).hex()}"
         return f"{prefix}:{serial}"
     elif wwn_type == 'naa':
         # see http://standards.ieee.org/develop/regauth/tut/fibre.pdf
         # 5 = IEEE registered
         # 001405 = OpenIB OUI (they let us use it I guess?)
         # rest = random
-        return "naa.5001405" + uuid.uuid4().hex[-9:]
+        return "naa.5001405" + os.urandom(5).hex()[1:]
     elif wwn_type == 'eui':
-        return "eui.001405" + uuid.uuid4().hex[-10:]
+        return "eui.001405" + os.urandom(5).hex()
     else:
         raise ValueError(f"Unknown WWN type: {wwn_type}")
 
@@ -364,6 +407,18 @@ def _cleanse_wwn(wwn_type, wwn):
 
     return wwn
 
+_iqn_re = re.compile(r"iqn\.[0-9]{4}-[0-1][0-9]\..*\..*")
+
+_wwn_test = {
+    'free': lambda wwn: True,  # noqa: ARG005 TODO
+    'iqn': lambda wwn: _iqn_re.match(wwn) and ' ' not in wwn and '_' not in wwn,
+    'naa': re.compile(r"naa\.[125c-fC-F][0-9a-fA-F]{15}$").match,
+    'eui': re.compile(r"eui\.[0-9a-f]{16}$").match,
+    'ib': re.compile(r"ib\.[0-9a-f]{32}$").match,
+    'unit_serial': re.compile(
+        "[0-9A-Fa-f]{8}(-[0-9A-Fa-f]{4}){3}-[0-9A-Fa-f]{12}$").match,
+}
+
 def normalize_wwn(wwn_types, wwn):
     '''
     Take a WWN as given by the user and convert it to a standard text
@@ -371,21 +426,9 @@ def normalize_wwn(wwn_types, wwn):
 
     Returns (normalized_wwn, wwn_type), or exception if invalid wwn.
     '''
-    wwn_test = {
-    'free': lambda wwn: True,  # noqa: ARG005 TODO
-    'iqn': lambda wwn: re.match(r"iqn\.[0-9]{4}-[0-1][0-9]\..*\..*", wwn)
-                       and not re.search(' ', wwn)
-                       and not re.search('_', wwn),
-    'naa': lambda wwn: re.match(r"naa\.[125c-fC-F][0-9a-fA-F]{15}$", wwn),
-    'eui': lambda wwn: re.match(r"eui\.[0-9a-f]{16}$", wwn),
-    'ib': lambda wwn: re.match(r"ib\.[0-9a-f]{32}$", wwn),
-    'unit_serial': lambda wwn: re.match(
-        "[0-9A-Fa-f]{8}(-[0-9A-Fa-f]{4}){3}-[0-9A-Fa-f]{12}$", wwn),
-    }
-
     for wwn_type in wwn_types:
         clean_wwn = _cleanse_wwn(wwn_type, wwn)
-        found_type = wwn_test[wwn_type](clean_wwn)
+        found_type = _wwn_test[wwn_type](clean_wwn)
         if found_type:
             break
     else: